@@ -2,15 +2,22 @@
 Implemented two advanced features: Spline Spine and Uniform Scaling
 '''
 
+import os
+from contextlib import contextmanager
+from functools import partial
 from PySide2.QtWidgets import *
 from PySide2.QtCore import *
 from PySide2.QtGui import *
 import maya.cmds as cmds
+import maya.api.OpenMaya as om2
        
 class AutoRiggerGUI(QDialog):
     '''
     The base class that handles the GUI for the Auto Rigger.
     '''
+    rigNodeNames = tuple(name for side in ('_l', '_r') for limb in ('leg', 'arm') # every ik handle and switch cleanup may have to move, built once
+                         for name in (limb + '_ik' + side, limb + side + '_ik', limb + side + '_switch'))
+
     def __init__(self):
         '''
         Initializes the GUI.
@@ -29,7 +36,7 @@ class AutoRiggerGUI(QDialog):
 
     def initWindow(self):
         self.setWindowTitle('Makra\'s Auto Rigger')
-        screenSize = self.screen().size()
+        screenSize = Helpers.screenSize()
         self.setMinimumSize(screenSize.width()//6,screenSize.height()//1.6)
 
     def initTabs(self):
@@ -43,20 +50,47 @@ class AutoRiggerGUI(QDialog):
         self.tabs.addTab(self.markersTab, 'Markers')
         self.tabs.addTab(self.jointsTab, 'Joints')
         self.tabs.setTabEnabled(1, False)
+        self.tabs.currentChanged.connect(self.onTabChanged)
 
     def initWidgets(self):
         '''
         Initializes the widgets for all the different parts of the body.
+        Only the markers tab is built here, the joints tab is built the first time it's opened.
         '''
         self.initCreateMarkersWidgets()
         self.initAdjustMarkersWidgets()
-        self.initCreateSkeletonWidgets()
-        self.initRootWidgets()
-        self.initSpineWidgets()
-        self.initHeadWidgets()
-        self.initArmsWidgets()
-        self.initLegsWidgets()
-        self.initFKIKSnappingWidgets()
+
+        self.jointsTabBuilders = [ # kept in the order the sections appear in the joints tab
+            self.initCreateSkeletonWidgets,
+            self.initRootWidgets,
+            self.initSpineWidgets,
+            self.initHeadWidgets,
+            self.initArmsWidgets,
+            self.initLegsWidgets,
+            self.initFKIKSnappingWidgets
+        ]
+
+    def onTabChanged(self, index):
+        '''
+        Builds the joints tab widgets the first time the joints tab is opened.
+        '''
+        if index == 1:
+            self.buildJointsTab()
+
+    def buildJointsTab(self):
+        '''
+        Runs the pending joints tab builders once, later calls don't do anything.
+        '''
+        if not self.jointsTabBuilders:
+            return
+
+        self.jointsTab.setUpdatesEnabled(False) # lay out and paint the tab once, not once per section
+
+        try:
+            while self.jointsTabBuilders:
+                self.jointsTabBuilders.pop(0)()
+        finally:
+            self.jointsTab.setUpdatesEnabled(True)
 
     def initLayout(self):
         '''
@@ -94,16 +128,11 @@ class AutoRiggerGUI(QDialog):
         dragHead = QLabel('Click-&-Drag', self)
         dragHead.move(20,20)
 
-        parentDir = cmds.internalVar(userScriptDir=True) # directory where script is located, make sure to have the icons folder in the same directory as the script
-        self.visualizer.addIcon(QPoint(60, 50), iconPath=os.path.join(parentDir, 'AutoRiggerIcons/legL.png'), iconLabel= 'Legs')
-        self.visualizer.addIcon(QPoint(110, 50), iconPath=os.path.join(parentDir, 'AutoRiggerIcons/legR.png'))
-        self.visualizer.addIcon(QPoint(60, 100), iconPath=os.path.join(parentDir, 'AutoRiggerIcons/armL.png'), iconLabel= 'Arms')
-        self.visualizer.addIcon(QPoint(110, 100), iconPath=os.path.join(parentDir, 'AutoRiggerIcons/armR.png'))
-        self.visualizer.addIcon(QPoint(60, 150), iconPath=os.path.join(parentDir, 'AutoRiggerIcons/spine.png'), iconLabel= 'Spine')
-        self.visualizer.addIcon(QPoint(60, 200), iconPath=os.path.join(parentDir, 'AutoRiggerIcons/head.png'), iconLabel= 'Head')
-        self.visualizer.addIcon(QPoint(60, 250), iconPath=os.path.join(parentDir, 'AutoRiggerIcons/root.png'), iconLabel= 'Root')
+        iconPaths = Visualizer.iconPaths()
+        for name, x, y, label in Visualizer.iconLayout:
+            self.visualizer.addIcon(QPoint(x, y), iconPixmap=Visualizer.loadIcon(iconPaths[name]), iconLabel=label)
 
-        self.visualizer.showRig()
+        QTimer.singleShot(0, self.visualizer.showRig) # playblast once the window is up and the visualizer has its real size
 
         self.createSkeletonGuidesBtn = QPushButton('Create Skeleton Guides')
                
@@ -149,7 +178,7 @@ class AutoRiggerGUI(QDialog):
         def createCustomSlider(name, min, max, init, connection):
             slider = CustomSlider(min, max, name=name)
             slider.setValue(init)
-            slider.connectValueChanged(connection)
+            slider.connectValueChanged(connection) # the slider debounces itself, the maya update only runs once the drag settles
             self.editMarkersLayout.addWidget(slider)
             return slider
 
@@ -187,10 +216,7 @@ class AutoRiggerGUI(QDialog):
         '''
         When the create markers button is clicked, the markers are created, the joints tab and Adjust Markers group box is enabled.
         '''
-        modelPanels = [panel for panel in cmds.getPanel(all=True) if cmds.getPanel(typeOf=panel) == 'modelPanel']
-        
-        for panel in modelPanels:
-            cmds.modelEditor(panel, edit=True, displayAppearance='wireframe') # change the display of the model panel to wireframe to make it easier to see the markers
+        self.setModelPanelsDisplay('wireframe') # change the display of the model panel to wireframe to make it easier to see the markers
 
         self.editMarkersGroupBox.setEnabled(True)
         self.createMarkersGroupBox.setDisabled(True)       
@@ -211,17 +237,41 @@ class AutoRiggerGUI(QDialog):
             self.tabs.setTabEnabled(1, True)
 
         self.markers = Markers.createMarkers(markers)
+        self.markersHandle = Helpers.getObjectHandle(self.markers) # persistent reference to the markers group, survives renames and skips name lookups
         self.updateMarkerData() # update marker data after creating the markers
 
+    def setModelPanelsDisplay(self, displayAppearance):
+        '''
+        Sets the display appearance of all the model panels.
+        The panel list is queried on every call, panels come and go when scenes or UI layouts get loaded.
+        The refresh is suspended while the panels are switched so the viewport only redraws once at the end.
+        '''
+        panels = [panel for panel in cmds.getPanel(type='modelPanel') or []
+                  if cmds.modelEditor(panel, q=True, displayAppearance=True) != displayAppearance] # the panels already in that mode are left alone
+
+        if not panels: # nothing to switch, no need for a redraw either
+            return
+
+        cmds.refresh(suspend=True)
+
+        try:
+            for panel in panels:
+                cmds.modelEditor(panel, edit=True, displayAppearance=displayAppearance)
+        finally:
+            cmds.refresh(suspend=False)
+            cmds.refresh(force=True)
+
     def updateMarkerData(self):
         '''
         Updates the marker data.
+        Walks the markers group through the maya python api 2.0 instead of calling cmds.xform for every marker.
         '''
-        self.markerData = {} # dictionary to store marker data in the same format of the default markers
-        self.markerNames = cmds.listRelatives(self.markers, children=True)
+        markersGrpFn = om2.MFnDagNode(self.markersHandle.object())
+        markerFns = [om2.MFnTransform(markersGrpFn.child(i)) for i in range(markersGrpFn.childCount())] # children come back as MObjects, so there is no name lookup per marker
 
-        for markerName in self.markerNames:
-            self.markerData[markerName] = cmds.xform(markerName, q=True, translation=True)
+        self.markerNames = [markerFn.name() for markerFn in markerFns]
+        self.markerData = {name: list(markerFn.translation(om2.MSpace.kTransform)) # dictionary to store marker data in the same format of the default markers
+                           for name, markerFn in zip(self.markerNames, markerFns)}
 
     def onMirrorMarkersBtnClicked(self):
         '''
@@ -230,11 +280,15 @@ class AutoRiggerGUI(QDialog):
         self.mirrorMarkersBtn.setEnabled(False)
         self.tabs.setTabEnabled(1, True)
 
-        for marker in self.markerNames:
-            if marker.endswith('_l'):
-                rightMarker = marker.replace('_l', '_r')
-                cmds.duplicate(marker, n=rightMarker)
-                cmds.setAttr(rightMarker + '.tx', -cmds.getAttr(marker + '.tx'))  
+        self.updateMarkerData() # one api pass to pick up the current marker positions instead of a getAttr per marker
+
+        leftMarkers = [marker for marker in self.markerNames if marker.endswith('_l')]
+        rightMarkers = [marker[:-2] + '_r' for marker in leftMarkers]
+
+        with Helpers.batchedMayaOp('mirrorMarkers'): # mirroring is a single undo step
+            for leftMarker, rightMarker in zip(leftMarkers, rightMarkers):
+                cmds.duplicate(leftMarker, n=rightMarker)
+                cmds.setAttr(rightMarker + '.tx', -self.markerData[leftMarker][0])
         
         self.updateMarkerData()
 
@@ -253,13 +307,11 @@ class AutoRiggerGUI(QDialog):
         '''
         self.updateMarkerData()
         
-        modelPanels = [panel for panel in cmds.getPanel(all=True) if cmds.getPanel(typeOf=panel) == 'modelPanel']
-        
-        for panel in modelPanels:
-            cmds.modelEditor(panel, edit=True, displayAppearance='smoothShaded') # change the display of the model panel back to smooth shaded
+        self.setModelPanelsDisplay('smoothShaded') # change the display of the model panel back to smooth shaded
 
-        self.skeleton = Skeleton.createSkeleton(self.markerData, self.splineSpine)
-        cmds.delete(self.markers)
+        with Helpers.batchedMayaOp('createSkeleton'): # deleting the markers and building the joints undo together
+            cmds.delete(Helpers.getNodeName(self.markersHandle)) # one delete for all the markers, the positions are already in markerData
+            self.skeleton = Skeleton.createSkeleton(self.markerData, self.splineSpine)
 
         self.rootGroupBox.setEnabled(True)
         self.createSkeletonBtn.setDisabled(True)
@@ -289,6 +341,10 @@ class AutoRiggerGUI(QDialog):
         self.legsFkRadioBtn = QRadioButton('FK')
         self.legsIkFkRadioBtn = QRadioButton('IK/FK')
 
+        self.legsModeGroup = QButtonGroup(self) # only these three exclude each other, no walk over the sibling buttons
+        for radioBtn in [self.legsIkRadioBtn, self.legsFkRadioBtn, self.legsIkFkRadioBtn]:
+            self.legsModeGroup.addButton(radioBtn)
+
         self.legsFkRadioBtn.setChecked(True)
 
         self.legsSpaceSwitchingCheckbox = QCheckBox('Space Switching')
@@ -319,6 +375,10 @@ class AutoRiggerGUI(QDialog):
         self.armsFkRadioBtn = QRadioButton('FK')
         self.armsIkFkRadioBtn = QRadioButton('IK/FK')
 
+        self.armsModeGroup = QButtonGroup(self) # only these three exclude each other, no walk over the sibling buttons
+        for radioBtn in [self.armsIkRadioBtn, self.armsFkRadioBtn, self.armsIkFkRadioBtn]:
+            self.armsModeGroup.addButton(radioBtn)
+
         self.armsFkRadioBtn.setChecked(True)
 
         self.armsSpaceSwitchingCheckbox = QCheckBox('Space Switching')
@@ -423,6 +483,9 @@ class AutoRiggerGUI(QDialog):
 
         self.fkikRadioBtn = QRadioButton('FK-IK')
         self.ikfkRadioBtn = QRadioButton('IK-FK')
+        self.snapOrderGroup = QButtonGroup(self) # the two orders only exclude each other, same as the legs and arms modes
+        self.snapOrderGroup.addButton(self.fkikRadioBtn)
+        self.snapOrderGroup.addButton(self.ikfkRadioBtn)
         self.fkikRadioBtn.setChecked(True)
 
         self.snapOrderLayout = QHBoxLayout()
@@ -435,16 +498,16 @@ class AutoRiggerGUI(QDialog):
         self.rArmBtn = QPushButton('Right Arm')
         self.armsLayout.addWidget(self.lArmBtn)
         self.armsLayout.addWidget(self.rArmBtn)
-        self.lArmBtn.clicked.connect(lambda: self.snapArmFKIK('_l'))
-        self.rArmBtn.clicked.connect(lambda: self.snapArmFKIK('_r'))
+        self.lArmBtn.clicked.connect(partial(self.snapArmFKIK, '_l'))
+        self.rArmBtn.clicked.connect(partial(self.snapArmFKIK, '_r'))
 
         self.legsLayout = QHBoxLayout()
         self.lLegBtn = QPushButton('Left Leg')
         self.rLegBtn = QPushButton('Right Leg')
         self.legsLayout.addWidget(self.lLegBtn)
         self.legsLayout.addWidget(self.rLegBtn)
-        self.lLegBtn.clicked.connect(lambda: self.snapLegFKIK('_l'))
-        self.rLegBtn.clicked.connect(lambda: self.snapLegFKIK('_r'))
+        self.lLegBtn.clicked.connect(partial(self.snapLegFKIK, '_l'))
+        self.rLegBtn.clicked.connect(partial(self.snapLegFKIK, '_r'))
 
         self.fkIkSnappingLayout.addLayout(self.armsLayout)
         self.fkIkSnappingLayout.addLayout(self.legsLayout)
@@ -457,9 +520,10 @@ class AutoRiggerGUI(QDialog):
         self.isLegFKIK = False
         self.isArmFKIK = False
 
-    def snapArmFKIK(self, side):
+    def snapArmFKIK(self, side, checked = False):
         '''
         Calls the snap methods for the arms.
+        Checked is the state sent along by the clicked signal, it's not used.
         '''
         fkCntrls = self.armFkCntrls[side] 
         ikJoints = self.armIkChains[side]
@@ -472,9 +536,10 @@ class AutoRiggerGUI(QDialog):
         else:
             FKIK.snapIKtoFK(fkCntrls, ikCntrls, ikHandle, ikPv, offset= 1)
 
-    def snapLegFKIK(self, side):
+    def snapLegFKIK(self, side, checked = False):
         '''
         Calls the snap methods for the legs.
+        Checked is the state sent along by the clicked signal, it's not used.
         '''
         fkCntrls = self.legFkCntrls[side]
         ikJoints = self.legIkChains[side]
@@ -491,118 +556,129 @@ class AutoRiggerGUI(QDialog):
         '''
         When the create legs controllers button is clicked, the legs controllers are created.
         '''
-        if self.legsFkRadioBtn.isChecked(): # FK
-            self.leftLegControls = FK.createFKCharacterControllers('thigh_l', controllerRadius=13)
-            self.rightLegControls = FK.createFKCharacterControllers('thigh_r', controllerRadius=13)
+        with Helpers.batchedMayaOp('createLegsControllers'): # the whole step is one undo, one dg flush and one redraw
+            rootParent = Helpers.getNodeName(self.rootParentHandle) # resolved once from the handle, every ik controller hangs under it
+
+            if self.legsFkRadioBtn.isChecked(): # FK
+                self.leftLegControls = FK.createFKCharacterControllers('thigh_l', controllerRadius=13)
+                self.rightLegControls = FK.createFKCharacterControllers('thigh_r', controllerRadius=13)
 
-            cmds.parent(self.leftLegControls[0] + '_parent', self.rootControls[-1])
-            cmds.parent(self.rightLegControls[0] + '_parent', self.rootControls[-1])
+                cmds.parent(self.leftLegControls[0] + '_parent', self.rootControls[-1])
+                cmds.parent(self.rightLegControls[0] + '_parent', self.rootControls[-1])
 
-        elif self.legsIkRadioBtn.isChecked(): # IK
-            for side in ['_l', '_r']:
-                IK.createStartJointController('thigh' + side, self.rootControls[1], 'thigh' + side, name = 'thigh' + side, controllerRadius=15)
-                handle, effector = IK.createIKHandle('thigh' + side, 'foot' + side, 'leg_ik' + side)
-                IK.createIKController(handle, 'ball' + side, self.rootControls[0] + '_parent', name = 'leg' + side, controllerRadius=8)
-                IK.createPoleVectorConstraint(handle, self.rootControls[0] + '_parent', 'knee' + side, name = 'pv_leg_' + side, controllerRadius=15)  
+            elif self.legsIkRadioBtn.isChecked(): # IK
+                for side in ['_l', '_r']:
+                    thigh, knee, foot, ball = ['thigh' + side, 'knee' + side, 'foot' + side, 'ball' + side] # per side joint names, built once
+
+                    IK.createStartJointController(thigh, self.rootControls[1], thigh, name = thigh, controllerRadius=15)
+                    handle, effector = IK.createIKHandle(thigh, foot, 'leg_ik' + side)
+                    IK.createIKController(handle, ball, rootParent, name = 'leg' + side, controllerRadius=8)
+                    IK.createPoleVectorConstraint(handle, rootParent, knee, name = 'pv_leg_' + side, controllerRadius=15)  
 
-            # self.creatFootControllers('ball', 'ctrl_leg')
+                # self.creatFootControllers('ball', 'ctrl_leg')
 
 
-        elif self.legsIkFkRadioBtn.isChecked():
-            self.legChains = {} # using dict to separate the sides (_l, _r)
-            self.legFkChains = {}
-            self.legIkChains = {}
-            self.legFkCntrls = {}
-            self.legStartCntrls = {}
-            self.legIkCntrls = {}
-            self.legPvCntrls = {}
-            self.legSwitches = {}
+            elif self.legsIkFkRadioBtn.isChecked():
+                self.legChains = {} # using dict to separate the sides (_l, _r)
+                self.legFkChains = {}
+                self.legIkChains = {}
+                self.legFkCntrls = {}
+                self.legStartCntrls = {}
+                self.legIkCntrls = {}
+                self.legPvCntrls = {}
+                self.legSwitches = {}
             
-            if self.legsIkFkRadioBtn.isChecked():
-                for side in ['_l', '_r']:
-                    self.legChains[side] = ['thigh' + side, 'knee' + side, 'foot' + side]
+                if self.legsIkFkRadioBtn.isChecked():
+                    for side in ['_l', '_r']:
+                        self.legChains[side] = ['thigh' + side, 'knee' + side, 'foot' + side]
                     
-                    (self.legFkChains[side], 
-                    self.legIkChains[side], 
-                    self.legFkCntrls[side], 
-                    self.legStartCntrls[side], 
-                    self.legIkCntrls[side], 
-                    self.legPvCntrls[side]) = FKIK.createFKIKAccessories(self.legChains[side], 'leg' + side, 
-                                                                    controllerRadius=13, fkParent=self.rootControls[1], 
-                                                                    ikParent=self.rootControls[0] + '_parent', 
-                                                                    ikStartParent=self.rootControls[1])
+                        (self.legFkChains[side], 
+                        self.legIkChains[side], 
+                        self.legFkCntrls[side], 
+                        self.legStartCntrls[side], 
+                        self.legIkCntrls[side], 
+                        self.legPvCntrls[side]) = FKIK.createFKIKAccessories(self.legChains[side], 'leg' + side, 
+                                                                        controllerRadius=13, fkParent=self.rootControls[1], 
+                                                                        ikParent=rootParent, 
+                                                                        ikStartParent=self.rootControls[1])
                                                                         
-                    self.legSwitches[side] = FKIK.createFKIKSwitch(self.legFkChains[side], self.legIkChains[side], 
-                                                                self.legChains[side], self.legFkCntrls[side], 
-                                                                self.legStartCntrls[side], self.legIkCntrls[side], 
-                                                                self.legPvCntrls[side], 'leg' + side + '_switch')
-                self.isLegFKIK = True
+                        self.legSwitches[side] = FKIK.createFKIKSwitch(self.legFkChains[side], self.legIkChains[side], 
+                                                                    self.legChains[side], self.legFkCntrls[side], 
+                                                                    self.legStartCntrls[side], self.legIkCntrls[side], 
+                                                                    self.legPvCntrls[side], 'leg' + side + '_switch')
+                    self.isLegFKIK = True
 
-            # self.creatFootControllers('ball')
+                # self.creatFootControllers('ball')
 
-        self.legsGroupBox.setDisabled(True)
-        self.cleanup() # organize the rig in the outliner
+            self.legsGroupBox.setDisabled(True)
+            self.cleanup() # organize the rig in the outliner
 
     def onCreateArmsControllersBtnClicked(self):
         '''
         When the create arms controllers button is clicked, the arms controllers are created.
         '''
-        if self.armsFkRadioBtn.isChecked(): # FK
-            self.leftArmControls = FK.createFKCharacterControllers('clavicle_l',controllerRadius=8)
-            self.rightArmControls = FK.createFKCharacterControllers('clavicle_r',controllerRadius=8)
+        with Helpers.batchedMayaOp('createArmsControllers'): # the whole step is one undo, one dg flush and one redraw
+            rootParent = Helpers.getNodeName(self.rootParentHandle) # resolved once from the handle, every ik controller hangs under it
+            spineEnd = Helpers.getNodeName(self.spineEndHandle)
 
-            cmds.parent(self.leftArmControls[0] + '_parent', self.spineControls[-1])
-            cmds.parent(self.rightArmControls[0] + '_parent', self.spineControls[-1])
+            if self.armsFkRadioBtn.isChecked(): # FK
+                self.leftArmControls = FK.createFKCharacterControllers('clavicle_l',controllerRadius=8)
+                self.rightArmControls = FK.createFKCharacterControllers('clavicle_r',controllerRadius=8)
+
+                cmds.parent(self.leftArmControls[0] + '_parent', spineEnd)
+                cmds.parent(self.rightArmControls[0] + '_parent', spineEnd)
         
-        elif self.armsIkRadioBtn.isChecked(): # IK
-            for side in ['_l', '_r']:
-                IK.createStartJointController('clavicle' + side, self.spineControls[-1], 'upperArm' + side, name = 'clavicle' + side, controllerRadius=12)
-                handle, effector = IK.createIKHandle('upperArm' + side, 'hand' + side,'arm_ik' + side)
-                self.ikControl = IK.createIKController(handle,'hand' + side, self.rootControls[0] + '_parent', name = 'arm' + side, controllerRadius=8)
-                IK.createPoleVectorConstraint(handle, self.rootControls[0] + '_parent', 'lowerArm' + side, name = 'pv_arm_' + side, controllerRadius=8)            
+            elif self.armsIkRadioBtn.isChecked(): # IK
+                for side in ['_l', '_r']:
+                    clavicle, upperArm, lowerArm, hand = ['clavicle' + side, 'upperArm' + side, 'lowerArm' + side, 'hand' + side] # per side joint names, built once
+
+                    IK.createStartJointController(clavicle, spineEnd, upperArm, name = clavicle, controllerRadius=12)
+                    handle, effector = IK.createIKHandle(upperArm, hand,'arm_ik' + side)
+                    self.ikControl = IK.createIKController(handle, hand, rootParent, name = 'arm' + side, controllerRadius=8)
+                    IK.createPoleVectorConstraint(handle, rootParent, lowerArm, name = 'pv_arm_' + side, controllerRadius=8)            
                 
-            # self.createFingerControllers('thumb', 'ctrl_arm') # spent so much time trying to get fingers to work only to know that it's not required
-            # self.createFingerControllers('index', 'ctrl_arm')
-            # self.createFingerControllers('middle', 'ctrl_arm')
-
-        elif self.armsIkFkRadioBtn.isChecked(): # IK/FK
-            self.armChains = {} # using dict to separate the sides (_l, _r)
-            self.armFkChains = {}
-            self.armIkChains = {}
-            self.armFkCntrls = {}
-            self.armStartCntrls = {}
-            self.armIkCntrls = {}
-            self.armPvCntrls = {}
-            self.armSwitches = {}
+                # self.createFingerControllers('thumb', 'ctrl_arm') # spent so much time trying to get fingers to work only to know that it's not required
+                # self.createFingerControllers('index', 'ctrl_arm')
+                # self.createFingerControllers('middle', 'ctrl_arm')
+
+            elif self.armsIkFkRadioBtn.isChecked(): # IK/FK
+                self.armChains = {} # using dict to separate the sides (_l, _r)
+                self.armFkChains = {}
+                self.armIkChains = {}
+                self.armFkCntrls = {}
+                self.armStartCntrls = {}
+                self.armIkCntrls = {}
+                self.armPvCntrls = {}
+                self.armSwitches = {}
             
-            for side in ['_l', '_r']:
-                self.armChains[side] = ['clavicle' + side, 'upperArm' + side, 'lowerArm' + side, 'hand' + side]
+                for side in ['_l', '_r']:
+                    self.armChains[side] = ['clavicle' + side, 'upperArm' + side, 'lowerArm' + side, 'hand' + side]
                 
-                (self.armFkChains[side], 
-                self.armIkChains[side], 
-                self.armFkCntrls[side], 
-                self.armStartCntrls[side], 
-                self.armIkCntrls[side], 
-                self.armPvCntrls[side]) = FKIK.createFKIKAccessories(self.armChains[side], 'arm' + side, 
-                                                                    controllerRadius=8, 
-                                                                    fkParent=self.spineControls[-1], 
-                                                                    ikParent=self.rootControls[0] + '_parent', 
-                                                                    ikStartParent=self.spineControls[-1], 
-                                                                    ikOffset=1)
+                    (self.armFkChains[side], 
+                    self.armIkChains[side], 
+                    self.armFkCntrls[side], 
+                    self.armStartCntrls[side], 
+                    self.armIkCntrls[side], 
+                    self.armPvCntrls[side]) = FKIK.createFKIKAccessories(self.armChains[side], 'arm' + side, 
+                                                                        controllerRadius=8, 
+                                                                        fkParent=spineEnd, 
+                                                                        ikParent=rootParent, 
+                                                                        ikStartParent=spineEnd, 
+                                                                        ikOffset=1)
                                                                     
-                self.armSwitches[side] = FKIK.createFKIKSwitch(self.armFkChains[side], self.armIkChains[side], 
-                                                            self.armChains[side], self.armFkCntrls[side], 
-                                                            self.armStartCntrls[side], self.armIkCntrls[side], 
-                                                            self.armPvCntrls[side], 'arm' + side + '_switch')
-            self.isArmFKIK = True
+                    self.armSwitches[side] = FKIK.createFKIKSwitch(self.armFkChains[side], self.armIkChains[side], 
+                                                                self.armChains[side], self.armFkCntrls[side], 
+                                                                self.armStartCntrls[side], self.armIkCntrls[side], 
+                                                                self.armPvCntrls[side], 'arm' + side + '_switch')
+                self.isArmFKIK = True
 
-            # self.createFingerControllers('thumb')
-            # self.createFingerControllers('index')
-            # self.createFingerControllers('middle')    
+                # self.createFingerControllers('thumb')
+                # self.createFingerControllers('index')
+                # self.createFingerControllers('middle')    
 
 
-        self.armsGroupBox.setDisabled(True)
-        self.legsGroupBox.setEnabled(True)
+            self.armsGroupBox.setDisabled(True)
+            self.legsGroupBox.setEnabled(True)
 
     def creatFootControllers(self, foot, parent = None):
         '''
@@ -625,45 +701,51 @@ class AutoRiggerGUI(QDialog):
         '''
         When the create spine controllers button is clicked, the spine controllers are created.
         '''
-        if self.splineSpine:
-            self.spineControls = IK.createSplineSpineIK('spine1', 'spine4', 'spine9', name = 'spine_ik')
-            cmds.parent(self.spineControls[-1], self.rootControls[-1])
-        else: 
-            self.spineControls = FK.createFKCharacterControllers(rootJoint='spine1', endJoint='spine3')
-            cmds.parent(self.spineControls[0] + '_parent', self.rootControls[-1])                 
+        with Helpers.batchedMayaOp('createSpineControllers'): # the whole step is one undo, one dg flush and one redraw
+            if self.splineSpine:
+                self.spineControls = IK.createSplineSpineIK('spine1', 'spine4', 'spine9', name = 'spine_ik')
+                cmds.parent(self.spineControls[-1], self.rootControls[-1])
+            else: 
+                self.spineControls = FK.createFKCharacterControllers(rootJoint='spine1', endJoint='spine3')
+                cmds.parent(self.spineControls[0] + '_parent', self.rootControls[-1])                 
 
-        self.spineGroupBox.setDisabled(True)
-        self.headGroupBox.setEnabled(True)
+            self.spineEndHandle = Helpers.getObjectHandle(self.spineControls[-1]) # the head and arms hang under it
+
+            self.spineGroupBox.setDisabled(True)
+            self.headGroupBox.setEnabled(True)
 
     def onCreateHeadControllersBtnClicked(self):
         '''
         When the create head controllers button is clicked, the head controllers are created.
         '''
-        self.headControls = FK.createFKCharacterControllers('neck', controllerRadius=10)
+        with Helpers.batchedMayaOp('createHeadControllers'): # the whole step is one undo, one dg flush and one redraw
+            self.headControls = FK.createFKCharacterControllers('neck', controllerRadius=10)
 
-        cmds.parent(self.headControls[0] + '_parent', self.spineControls[-1])
+            cmds.parent(self.headControls[0] + '_parent', Helpers.getNodeName(self.spineEndHandle))
 
-        self.headGroupBox.setDisabled(True)
-        self.armsGroupBox.setEnabled(True)
+            self.headGroupBox.setDisabled(True)
+            self.armsGroupBox.setEnabled(True)
 
     def onCreateRootControllersBtnClicked(self):
         '''
         When the create root controllers button is clicked, the root controllers are created.
         '''
-        self.rootControls = FK.createFKCharacterControllers(rootJoint='root', endJoint='pelvis')
+        with Helpers.batchedMayaOp('createRootControllers'): # the whole step is one undo, one dg flush and one redraw
+            self.rootControls = FK.createFKCharacterControllers(rootJoint='root', endJoint='pelvis')
+            self.rootParentHandle = Helpers.getObjectHandle(self.rootControls[0] + '_parent') # persistent reference, later steps don't have to rebuild and resolve the name
 
-        cmds.delete('root_parentConstraint1', 'pelvis_parentConstraint1') # remove 90 degree rotation on ctrl_root_parent
-        cmds.makeIdentity(self.rootControls[0] + '_parent', apply=True, t=1, r=1, s=1, n=0, pn=1)
-        cmds.parentConstraint('ctrl_root', 'root', mo=True, name='root_parentConstraint1')
-        cmds.parentConstraint('ctrl_pelvis', 'pelvis', mo=True, name='pelvis_parentConstraint1')
+            cmds.delete('root_parentConstraint1', 'pelvis_parentConstraint1') # remove 90 degree rotation on ctrl_root_parent
+            cmds.makeIdentity(self.rootControls[0] + '_parent', apply=True, t=1, r=1, s=1, n=0, pn=1)
+            cmds.parentConstraint('ctrl_root', 'root', mo=True, name='root_parentConstraint1')
+            cmds.parentConstraint('ctrl_pelvis', 'pelvis', mo=True, name='pelvis_parentConstraint1')
 
-        self.scaleUniform = False
+            self.scaleUniform = False
 
-        if self.rootUniformScaleCheckbox.isChecked():
-            self.scaleUniform = True
+            if self.rootUniformScaleCheckbox.isChecked():
+                self.scaleUniform = True
 
-        self.rootGroupBox.setDisabled(True)
-        self.spineGroupBox.setEnabled(True)
+            self.rootGroupBox.setDisabled(True)
+            self.spineGroupBox.setEnabled(True)
 
     def createUnifromScaling(self, rootCntrl, parentGrp):
         '''
@@ -672,16 +754,14 @@ class AutoRiggerGUI(QDialog):
         parentKids = cmds.listRelatives(parentGrp, children=True)
         parentKids.remove(rootCntrl + '_parent')
 
-        for kid in parentKids: # Move everything under the root control to allow for uniform scaling
-            print(kid)
-            cmds.parent(kid, rootCntrl)
+        if parentKids: # Move everything under the root control to allow for uniform scaling, parent takes the whole list in one call
+            cmds.parent(parentKids, rootCntrl)
             
         rootCntrlKids = cmds.listRelatives(rootCntrl + '_parent', children=True)
         rootCntrlKids.remove(rootCntrl)
 
-        for kid in rootCntrlKids:
-            print(kid)
-            cmds.parent(kid, rootCntrl)
+        if rootCntrlKids:
+            cmds.parent(rootCntrlKids, rootCntrl)
 
     # def onHW7ButtonClicked(self):
     #     '''
@@ -701,87 +781,125 @@ class AutoRiggerGUI(QDialog):
     def createSectionLayout(self, radioButtons, checkBoxes, createButton):
         '''
         Since the layout for the different sections are similar, we use this modular method to create the layout for each section.
+        Everything goes in a single grid, radio buttons on the first row, checkboxes on the next and the button spanning the last one.
         '''
-        sectionLayout = QVBoxLayout()
+        sectionLayout = QGridLayout()
 
-        if radioButtons:
-            radioButtonLayout = QHBoxLayout()
-            for radioButton in radioButtons:
-                radioButtonLayout.addWidget(radioButton)
-            sectionLayout.addLayout(radioButtonLayout)
+        row = 0
 
-        if checkBoxes:
-            checkboxLayout = QHBoxLayout()
-            for checkBox in checkBoxes:
-                checkboxLayout.addWidget(checkBox)
-            sectionLayout.addLayout(checkboxLayout)
+        for widgets in [radioButtons, checkBoxes]:
+            if widgets:
+                for column, widget in enumerate(widgets):
+                    sectionLayout.addWidget(widget, row, column)
+                row += 1
 
-        sectionLayout.addWidget(createButton)
+        sectionLayout.addWidget(createButton, row, 0, 1, max(len(radioButtons), len(checkBoxes), 1))
 
         return sectionLayout    
     
+    def markersExist(self):
+        '''
+        Checks if there's a markers group for the sliders to move.
+        It's not there before the markers are created, and the user could've deleted it from the scene since.
+        '''
+        return self.markers is not None and self.markersHandle.isValid() # the handle check is a pointer test, no name lookup
+
     def adjustMarkersScale(self):
         '''
         Adjusts the scale of the markers for the skeleton guides.
         '''
-        cmds.scale(float(self.scaleXSlider.value())/100, float(self.scaleYSlider.value())/100, float(self.scaleZSlider.value())/100, self.markers)
+        if not self.markersExist():
+            return
+
+        cmds.scale(float(self.scaleXSlider.value())/100, float(self.scaleYSlider.value())/100, float(self.scaleZSlider.value())/100, Helpers.getNodeName(self.markersHandle)) # the handle follows the group through renames
 
     def adjustMarkersOffset(self):
         '''
         Adjusts the offset of the markers for the skeleton guides.
         '''
-        cmds.xform(self.markers, translation=(float(self.offsetXSlider.value()), float(self.offsetYSlider.value()), float(self.offsetZSlider.value())))
+        if not self.markersExist():
+            return
+
+        cmds.xform(Helpers.getNodeName(self.markersHandle), translation=(float(self.offsetXSlider.value()), float(self.offsetYSlider.value()), float(self.offsetZSlider.value())))
 
     def adjustMarkersRotation(self):
         '''
         Adjusts the rotation of the markers for the skeleton guides.
         '''
-        cmds.xform(self.markers, rotation=(float(self.rotXSlider.value()), float(self.rotYSlider.value()), float(self.rotZSlider.value())))
+        if not self.markersExist():
+            return
+
+        cmds.xform(Helpers.getNodeName(self.markersHandle), rotation=(float(self.rotXSlider.value()), float(self.rotYSlider.value()), float(self.rotZSlider.value())))
 
     def cleanup(self):
         '''
         Organizes the rig in the outliner.
         '''   
-        parentGrp = cmds.group(em=True, n='rig')
-        cmds.parent(self.rootControls[0] + '_parent', parentGrp)
-        cmds.parent(self.skeleton[0], parentGrp)      
-
-        for side in ['_l', '_r']: # send the ik handle in the controllers group
-            if cmds.objExists('leg_ik' + side):
-                cmds.parent('leg_ik' + side, parentGrp)
-            if cmds.objExists('arm_ik' + side):
-                cmds.parent('arm_ik' + side, parentGrp)
-            if cmds.objExists('leg' + side + '_ik'):
-                cmds.parent('leg' + side + '_ik', parentGrp)
-            if cmds.objExists('arm' + side + '_ik'):
-                cmds.parent('arm' + side + '_ik', parentGrp)   
-            if cmds.objExists('leg'+ side + '_switch'):
-                cmds.parent('leg' + side + '_switch', parentGrp)
-            if cmds.objExists('arm'+ side + '_switch'):
-                cmds.parent('arm' + side + '_switch', parentGrp)
-
-        if self.scaleUniform: # send everything under the root control to allow for uniform scaling
-            self.createUnifromScaling(self.rootControls[0], parentGrp)
-
-        # cmds.scaleConstraint(self.rootControls[0], parentGrp, maintainOffset=True) #uniform scaling
-        # cmds.setAttr(self.rootControls[0] + '.inheritsTransform', 0)
-
-        if self.isLegFKIK or self.isArmFKIK: # selectively enable the fkik snapping group box based on the rig created                 
-            self.fkIkSnappingGroupBox.setEnabled(True)
-
-            if self.isLegFKIK is False:
-                self.lLegBtn.setDisabled(True)
-                self.rLegBtn.setDisabled(True)
+        with Helpers.batchedMayaOp('cleanup'):
+            parentGrp = cmds.group(em=True, n='rig')
+            cmds.parent(Helpers.getNodeName(self.rootParentHandle), parentGrp)
+            cmds.parent(self.skeleton[0], parentGrp)      
+
+            rigNodes = cmds.ls(list(AutoRiggerGUI.rigNodeNames)) # send the ik handles and switches in the controllers group, ls drops the ones that weren't created
+            if rigNodes:
+                cmds.parent(rigNodes, parentGrp)
+
+            if self.scaleUniform: # send everything under the root control to allow for uniform scaling
+                self.createUnifromScaling(self.rootControls[0], parentGrp)
+
+            # cmds.scaleConstraint(self.rootControls[0], parentGrp, maintainOffset=True) #uniform scaling
+            # cmds.setAttr(self.rootControls[0] + '.inheritsTransform', 0)
+
+            if self.isLegFKIK or self.isArmFKIK: # selectively enable the fkik snapping group box based on the rig created                 
+                self.fkIkSnappingGroupBox.setEnabled(True)
+
+                if self.isLegFKIK is False:
+                    self.lLegBtn.setDisabled(True)
+                    self.rLegBtn.setDisabled(True)
                 
-            if self.isArmFKIK is False:
-                self.lArmBtn.setDisabled(True)
-                self.rArmBtn.setDisabled(True)
+                if self.isArmFKIK is False:
+                    self.lArmBtn.setDisabled(True)
+                    self.rArmBtn.setDisabled(True)
         
     
 class Visualizer(QLabel):
     '''
     This class represents the visualizer widget that is used to create the skeleton guides.
     '''
+    iconLayout = [ # icon name, position and label of every icon in the visualizer
+        ('legL', 60, 50, 'Legs'), ('legR', 110, 50, None),
+        ('armL', 60, 100, 'Arms'), ('armR', 110, 100, None),
+        ('spine', 60, 150, 'Spine'), ('head', 60, 200, 'Head'), ('root', 60, 250, 'Root')
+    ]
+    iconNames = [name for name, x, y, label in iconLayout] # taken from the layout so there's only one table to keep up to date
+    iconPathsCache = None # filled the first time the icon paths are asked for
+    labelOffset = QPoint(-50, 0) # icons are 30 wide plus a 20 gap, hardcoded for now
+
+    @staticmethod
+    def iconPaths():
+        '''
+        Returns a dictionary of icon name to icon path, the paths are only built once.
+        '''
+        if Visualizer.iconPathsCache is None:
+            iconDir = os.path.join(cmds.internalVar(userScriptDir=True), 'AutoRiggerIcons') # make sure to have the icons folder in the same directory as the script
+            Visualizer.iconPathsCache = {name: os.path.join(iconDir, name + '.png') for name in Visualizer.iconNames}
+
+        return Visualizer.iconPathsCache
+
+    @staticmethod
+    def loadIcon(iconPath):
+        '''
+        Returns the pixmap for the given icon.
+        The decoded pixmap is kept in the QPixmapCache so reopening the window doesn't read the icons from disk again.
+        '''
+        pixmap = QPixmap()
+
+        if not QPixmapCache.find(iconPath, pixmap):
+            pixmap.load(iconPath)
+            QPixmapCache.insert(iconPath, pixmap)
+
+        return pixmap
+
     def __init__(self, parent=None):
         '''
         Initializes the GUI of visualizer widget.
@@ -794,22 +912,25 @@ class Visualizer(QLabel):
         Sets the frame style, alignment and minimum size for the visualizer widget.
         '''
         self.setFrameStyle(QFrame.Sunken | QFrame.Panel)
-        self.screenSize = self.screen().size()
+        self.screenSize = Helpers.screenSize()
         self.setMinimumSize(self.screenSize.width()//6,self.screenSize.height()//2)
         self.setAlignment(Qt.AlignCenter)
 
-    def addIcon(self, position, iconLabel = None, iconPath=None):  
+        self.rigPixmap = QPixmap() # reused for every playblast instead of allocating a new one
+        self.playblastPath = os.path.join(cmds.internalVar(userTmpDir=True), 'autoRiggerVisualizer.jpg') # one temp file that every playblast overwrites
+
+    def addIcon(self, position, iconLabel = None, iconPath=None, iconPixmap=None):  
         '''
         Method to add an icon to the visualizer widget.
-        Icons could have a label or not.
+        Icons could have a label or not, and can be given either as a path or as an already loaded pixmap.
         '''     
-        icon = DraggableIcon(self, iconPath)
+        icon = DraggableIcon(self, iconPath, iconPixmap)
         icon.move(position)
         icon.show()
 
         if iconLabel is not None:
             label = QLabel(iconLabel, self)
-            label.move(position + QPoint(-(icon.width() + 20), 0))  # hardcoded for now
+            label.move(position + Visualizer.labelOffset)
             label.show()
 
     def showRig(self): 
@@ -818,7 +939,8 @@ class Visualizer(QLabel):
         Currently, it takes a playblast of the current frame and displays it in the visualizer widget.
         So the user needs to repostion the camera in the model view so that they can work easily with the visualizer.
         '''      
-        displayImg = cmds.playblast(completeFilename=True, format='image', 
+        cmds.playblast(completeFilename=self.playblastPath, format='image', 
+                        compression='jpg', quality=70, # a jpeg is much quicker to write and decode than the default
                         width=self.screenSize.width()//3, 
                         height=self.screenSize.height(), 
                         showOrnaments=False, 
@@ -826,12 +948,36 @@ class Visualizer(QLabel):
                         viewer=False, 
                         offScreen=True)        
         
-        self.setPixmap(QPixmap(displayImg))
+        self.rigPixmap.load(self.playblastPath)
+        self.setPixmap(self.rigPixmap.scaled(self.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
+
+    def resizeEvent(self, event):
+        '''
+        Rescales the last playblast to the new size of the visualizer.
+        Resizing fires this over and over, so it's a fast scale from the original pixmap rather than a smooth one.
+        '''
+        super(Visualizer, self).resizeEvent(event)
+
+        if not self.rigPixmap.isNull():
+            self.setPixmap(self.rigPixmap.scaled(self.size(), Qt.KeepAspectRatio, Qt.FastTransformation))
 
 class CustomSlider(QWidget):
     '''
     A class to create a custom slider that I've tried replicating from the Maya cmds UI.
     '''
+    valueSettled = Signal(int) # the single notification the outside sees, once per settled change
+    validators = {} # one int validator per slider range, shared by every slider with that range
+
+    @staticmethod
+    def sharedValidator(minimum, maximum):
+        '''
+        Returns the validator for the text field, the slider only holds ints so the text field only takes ints in its range.
+        '''
+        if (minimum, maximum) not in CustomSlider.validators:
+            CustomSlider.validators[(minimum, maximum)] = QIntValidator(minimum, maximum)
+
+        return CustomSlider.validators[(minimum, maximum)]
+
     def __init__(self, minimum, maximum, parent=None, name=None):
         '''
         Initializes the custom slider and sets the range, value.
@@ -855,10 +1001,18 @@ class CustomSlider(QWidget):
         self.currentValue = QLineEdit(str(minimum), self)
         self.currentValue.setFixedWidth(60)
 
-        self.currentValue.setValidator(QDoubleValidator(minimum, 99999, 2)) # why don't they allow for float(inf) as max value? :/
+        self.currentValue.setValidator(CustomSlider.sharedValidator(minimum, maximum)) # editingFinished only fires for an int in range
+
+        self.debounceTimer = QTimer(self) # coalesces a burst of changes into a single call of the connected delegates
+        self.debounceTimer.setSingleShot(True)
+        self.debounceTimer.setInterval(50)
+        self.debounceTimer.timeout.connect(self.emitValueSettled)
+        self.settledValue = minimum # last value the delegates were told about
         
         self.slider.valueChanged.connect(self.updateCurrentValue)
-        self.currentValue.textChanged.connect(self.updateSliderValue)
+        self.currentValue.editingFinished.connect(self.updateSliderValue) # typed values are committed on enter / focus out, not per keystroke
+        self.slider.valueChanged.connect(self.scheduleValueChanged) # the only path to the delegates, typed values reach it through the slider
+        self.slider.sliderReleased.connect(self.scheduleValueChanged) # drags only commit once the handle is let go
 
         layout = QHBoxLayout(self)
         if name is not None:
@@ -874,20 +1028,31 @@ class CustomSlider(QWidget):
         '''
         Updates the text field with the current value of the slider.
         '''
+        blocker = QSignalBlocker(self.currentValue) # a programmatic setText isn't a user edit, nothing downstream should hear about it
         self.currentValue.setText(str(value))
+        blocker.unblock()
     
     def updateSliderValue(self):
         '''
         Updates the slider with the current value of the text field.
         '''
-        value = int(float(self.currentValue.text()))
-        self.slider.setValue(int(value))
+        try:
+            value = int(self.currentValue.text())
+        except ValueError: # incomplete input, e.g. '' or '-'
+            return
+
+        self.slider.setValue(value) # left unblocked, valueChanged is what notifies the delegates
     
     def setValue(self, value):
         '''
-        Sets the value of the slider.
+        Sets the value of the slider, programmatic changes don't reach the connected delegates.
         '''
+        blocker = QSignalBlocker(self.slider)
         self.slider.setValue(value)
+        blocker.unblock()
+
+        self.updateCurrentValue(self.slider.value()) # the text field was skipped along with the delegates
+        self.settledValue = self.slider.value()
     
     def value(self):
         '''
@@ -895,18 +1060,38 @@ class CustomSlider(QWidget):
         '''
         return self.slider.value()
     
+    def scheduleValueChanged(self, *args):
+        '''
+        Restarts the debounce timer, the delegates only get called once the value stops changing.
+        '''
+        if self.slider.isSliderDown(): # still dragging, sliderReleased will schedule the update
+            return
+        self.debounceTimer.start()
+
+    def emitValueSettled(self):
+        '''
+        Emits valueSettled when the debounce timer runs out, unless the value ended up where it was last time.
+        '''
+        value = self.slider.value()
+        if value == self.settledValue: # e.g. dragged away and back, nothing for the delegates to do
+            return
+
+        self.settledValue = value
+        self.valueSettled.emit(value)
+    
     def connectValueChanged(self, func):
         '''
-        Connects the valueChanged signal to a delegate function.
+        Connects a delegate function that gets called once the value settles after a change, or when a drag is released.
         '''
-        self.slider.valueChanged.connect(func)
-        self.currentValue.textChanged.connect(func)
+        self.valueSettled.connect(func)
 
 class DraggableIcon(QLabel):
     '''
     This class represents the draggable icons that are used to create the skeleton guides.
     '''
-    def __init__(self, parent=None, iconPath=None):
+    scaledPixmaps = {} # (pixmap cache key, size) -> scaled pixmap, every icon gets decoded and scaled only once
+
+    def __init__(self, parent=None, iconPath=None, iconPixmap=None):
         '''
         The variables get initialized and the icon is set.
         '''
@@ -914,7 +1099,18 @@ class DraggableIcon(QLabel):
         self.setFixedSize(30, 30)  # hardcoded for now
         self.iconPath = iconPath
         self.dragging = False
-        self.setPixmap(QPixmap(iconPath).scaled(self.size()))  
+
+        if iconPixmap is None:
+            iconPixmap = Visualizer.loadIcon(iconPath) # shared through the QPixmapCache instead of read from disk per icon
+
+        key = (iconPixmap.cacheKey(), self.width(), self.height())
+        scaledPixmap = DraggableIcon.scaledPixmaps.get(key)
+
+        if scaledPixmap is None:
+            scaledPixmap = iconPixmap.scaled(self.size())
+            DraggableIcon.scaledPixmaps[key] = scaledPixmap
+
+        self.setPixmap(scaledPixmap)
 
     def mousePressEvent(self, event):
         '''
@@ -922,14 +1118,23 @@ class DraggableIcon(QLabel):
         '''
         if event.button() == Qt.LeftButton:
             self.dragging = True
-            self.dragStartPosition = event.pos() # record init pos of drag
+            self.dragStarted = False # the icon only starts following the mouse past the drag distance
+            self.dragStartPosition = event.globalPos() # record init pos of drag
+            self.dragAnchor = self.pos() - event.globalPos() # offset from the cursor to the icon's spot in the parent, fixed for the whole drag
 
     def mouseMoveEvent(self, event):
         '''
         When icon is being dragged
         '''
-        if self.dragging:
-            self.move(self.mapToParent(event.pos() - self.dragStartPosition)) # move icon with mouse
+        if not self.dragging:
+            return
+
+        if not self.dragStarted: # ignore the jitter of a plain click
+            if (event.globalPos() - self.dragStartPosition).manhattanLength() < QApplication.startDragDistance():
+                return
+            self.dragStarted = True
+
+        self.move(self.dragAnchor + event.globalPos()) # move icon with mouse, no coordinate mapping per event
 
     def mouseReleaseEvent(self, event):
         '''
@@ -963,45 +1168,44 @@ class FKIK:
         '''
         Given a joint chain, it creates the FKIK switch.
         '''
-        fkChain = FKIK.duplicateChain(jointChain, 'fk_' + prefix)
-        ikChain = FKIK.duplicateChain(jointChain, 'ik_' + prefix)
+        with Helpers.batchedMayaOp('createFKIKAccessories'): # no redraws while the chains and controls are built
+            fkChain = FKIK.duplicateChain(jointChain, 'fk_' + prefix)
+            ikChain = FKIK.duplicateChain(jointChain, 'ik_' + prefix)
 
-        fkCntrls = FK.createFKCharacterControllers(fkChain[0], parent=None, endJoint=fkChain[-1], controllerRadius=controllerRadius)
-        cmds.parent(fkCntrls[0] + '_parent', fkParent)
+            fkCntrls = FK.createFKCharacterControllers(fkChain[0], parent=None, endJoint=fkChain[-1], controllerRadius=controllerRadius)
+            cmds.parent(fkCntrls[0] + '_parent', fkParent)
 
-        startCntrl = IK.createStartJointController(ikChain[0], ikStartParent, ikChain[ikOffset], prefix + '_start_ik', controllerRadius=controllerRadius)
-        ikHandle, effector = IK.createIKHandle(ikChain[ikOffset], ikChain[-1], prefix + '_ik')
-        ikCntrl = IK.createIKController(ikHandle, ikChain[-1], ikParent, prefix + '_ik', controllerRadius=controllerRadius)
-        pvJoint = cmds.listRelatives(ikChain[-1], parent=True)[0]
-        pvCntrl = IK.createPoleVectorConstraint(ikHandle, ikParent, pvJoint, prefix + '_pv', controllerRadius=controllerRadius)
+            startCntrl = IK.createStartJointController(ikChain[0], ikStartParent, ikChain[ikOffset], prefix + '_start_ik', controllerRadius=controllerRadius)
+            ikHandle, effector = IK.createIKHandle(ikChain[ikOffset], ikChain[-1], prefix + '_ik')
+            ikCntrl = IK.createIKController(ikHandle, ikChain[-1], ikParent, prefix + '_ik', controllerRadius=controllerRadius)
+            pvJoint = ikChain[-2] # duplicateChain parents every joint under the previous one, no need to ask maya
+            pvCntrl = IK.createPoleVectorConstraint(ikHandle, ikParent, pvJoint, prefix + '_pv', controllerRadius=controllerRadius)
 
-        return fkChain, ikChain, fkCntrls, startCntrl, ikCntrl, pvCntrl # keeping track of the controls and chains     
+            return fkChain, ikChain, fkCntrls, startCntrl, ikCntrl, pvCntrl # keeping track of the controls and chains     
     
     @staticmethod
     def createFKIKSwitch(fkChain, ikChain, bindChain, fkCntrls, startCntrl, ikCntrl, pvCntrl, switchName):
         '''
         Creates the FKIK switch.
         '''
-        switchCtrl = cmds.circle(n=switchName, nr=(0,0,1), c=(-20, 0, 0), r=5)[0]
+        switchCtrl = cmds.circle(n=switchName, nr=(0,0,1), c=(-20, 0, 0), r=5, ch=False)[0]
         Helpers.changeControllerProperites(switchCtrl, color=17, width=2) # give it a distinct look
 
-        cmds.delete(cmds.parentConstraint(bindChain[-1], switchCtrl))
+        cmds.matchTransform(switchCtrl, bindChain[-1], pos=True, rot=True)
 
         cmds.addAttr(switchCtrl, ln='FKIK_Switch', at='enum', en='fk:ik:', k=True) # using enums instead of bools :)
 
+        reverseNode = cmds.shadingNode('reverse', asUtility=True, n=switchName + '_reverse') # to get the opposite of the switch i.e fk, one node drives the whole limb
+        cmds.connectAttr(switchCtrl + '.FKIK_Switch', reverseNode + '.inputX')
+
         for fk, ik, b in zip(fkChain, ikChain, bindChain):
             oc = cmds.orientConstraint(fk, ik, b, mo=True)[0]
 
             cmds.connectAttr(switchCtrl + '.FKIK_Switch', oc + '.w1')
-            reverseNode = cmds.shadingNode('reverse', asUtility=True, n='reverse_' + b) # to get the opposite of the switch i.e fk
-            cmds.connectAttr(switchCtrl + '.FKIK_Switch', reverseNode + '.inputX')
             cmds.connectAttr(reverseNode + '.outputX', oc + '.w0')
 
-        reverseVis =  cmds.shadingNode('reverse', asUtility=True, n=switchName + '_reverseVis') # again to get the opposite of the switch i.e fk
-        cmds.connectAttr(switchCtrl + '.FKIK_Switch', reverseVis + '.inputX')
-
         for fkCntrl in fkCntrls:
-            cmds.connectAttr(reverseVis + '.outputX', fkCntrl + '.visibility')
+            cmds.connectAttr(reverseNode + '.outputX', fkCntrl + '.visibility')
 
         cmds.connectAttr(switchCtrl + '.FKIK_Switch', startCntrl + '.visibility', f=True)
         cmds.connectAttr(switchCtrl + '.FKIK_Switch', ikCntrl + '.visibility', f=True)
@@ -1017,9 +1221,7 @@ class FKIK:
         Snaps FK controls to match the pose of IK controls.
         '''
         for fk, ik in zip(fkControls, ikJoints): # match the pose of the fk controls to the ik joints
-            for attr in['rx', 'ry', 'rz']:
-                curr = cmds.getAttr(ik + '.' + attr)
-                cmds.setAttr(fk + '.' + attr, curr)
+            cmds.setAttr(fk + '.rotate', *cmds.getAttr(ik + '.rotate')[0]) # the whole compound at once, 2 commands instead of 6
 
     @staticmethod
     def snapIKtoFK(fkControls, ikControls, ikHandle, ikPv, offset = 0):
@@ -1028,15 +1230,15 @@ class FKIK:
         '''
         cmds.matchTransform(ikHandle, fkControls[-1], pos=True, rot=True)
 
-        initPos = cmds.xform(fkControls[0 + offset], q=True, ws=True, t=True) # start of the fk chain
-        midPos = cmds.xform(fkControls[1 + offset], q=True, ws=True, t=True) # mid of the fk chain (assuming 3 joints in the fk chain) (elbow or knee)
-        finPos = cmds.xform(fkControls[-1], q=True, ws=True, t=True) # end of the fk chain
-        meanPos = [(initPos[i] + finPos[i]) / 2 for i in range(3)] 
+        initPos = Helpers.getWorldTranslation(fkControls[0 + offset]) # start of the fk chain
+        midPos = Helpers.getWorldTranslation(fkControls[1 + offset]) # mid of the fk chain (assuming 3 joints in the fk chain) (elbow or knee)
+        finPos = Helpers.getWorldTranslation(fkControls[-1]) # end of the fk chain
+        meanPos = (initPos + finPos) * 0.5
         
-        dir = [midPos[i] - meanPos[i] for i in range(3)] # direction vector from the mid point to the mid joint
-        pvPos = [midPos[i] + dir[i] * 2 for i in range(3)] # pole vector position (2x because it's a bit far from the mid joint)
+        dir = midPos - meanPos # direction vector from the mid point to the mid joint
+        pvPos = midPos + dir * 2 # pole vector position (2x because it's a bit far from the mid joint)
 
-        cmds.move(pvPos[0], pvPos[1], pvPos[2], ikPv)
+        cmds.move(pvPos.x, pvPos.y, pvPos.z, ikPv) # the write stays on cmds so the snap can be undone
 
 class IK:
     '''
@@ -1055,11 +1257,10 @@ class IK:
         '''
         Creates a pole vector constraint between the pole vector and the IK handle.
         '''
-        poleVector = cmds.circle(n='ctrl_' + name, nr=(1, 0, 0), c=(0, 0, 0), r=controllerRadius)[0]
+        poleVector = cmds.circle(n='ctrl_' + name, nr=(1, 0, 0), c=(0, 0, 0), r=controllerRadius, ch=False)[0]
         Helpers.changeControllerProperites(poleVector, color=13)
 
-        cmds.pointConstraint(joint, poleVector)
-        cmds.delete(poleVector, cn=True)
+        cmds.matchTransform(poleVector, joint, pos=True) # snap without creating and deleting a constraint
 
         cmds.poleVectorConstraint(poleVector, ikHandle)
         cmds.parent(poleVector, parent)
@@ -1071,15 +1272,13 @@ class IK:
         '''
         Creates a controller for the start joint of the IK handle.
         '''
-        controller = cmds.circle(n='ctrl_' + name, nr=(1, 0, 0), c=(0, 0, 0), r=controllerRadius)[0]
+        controller = cmds.circle(n='ctrl_' + name, nr=(1, 0, 0), c=(0, 0, 0), r=controllerRadius, ch=False)[0]
         Helpers.changeControllerProperites(controller, color=13)
 
-        cmds.pointConstraint(child, controller)
-        cmds.delete(controller, cn=True)
+        cmds.matchTransform(controller, child, pos=True)
 
         cmds.parent(controller, parent)
         cmds.makeIdentity(controller, apply=True, r=True, s=True, t=True, n=False, pn=True)
-        cmds.delete(controller, ch=True)
 
         cmds.aimConstraint(controller, joint, mo=True, wut='None')
         Helpers.lockAndHide(controller, ['rx', 'ry', 'rz', 'sx', 'sy', 'sz'])
@@ -1091,17 +1290,13 @@ class IK:
         '''
         Creates an IK control for the IK handle.
         '''
-        controller = cmds.circle(n='ctrl_' + name, nr=(1, 0, 0), c=(0, 0, 0), r=controllerRadius)[0]
+        controller = cmds.circle(n='ctrl_' + name, nr=(1, 0, 0), c=(0, 0, 0), r=controllerRadius, ch=False)[0]
         Helpers.changeControllerProperites(controller, color=13)
 
-        ctrlParent = cmds.group(em=True, n='ctrl_' + name + '_parent')
+        ctrlParent = cmds.group(em=True, n=controller + '_parent') # reuse the name the circle actually got
         cmds.parent(controller, ctrlParent)
 
-        cmds.pointConstraint(joint, ctrlParent, mo=False)
-        cmds.orientConstraint(joint, ctrlParent, mo=False)
-
-        cmds.delete(ctrlParent, cn=True)
-        cmds.makeIdentity(controller, apply=True, r=True, s=True, t=True, n=False, pn=True)
+        cmds.matchTransform(ctrlParent, joint, pos=True, rot=True) # only the parent group moves, the controller stays at identity
         
         cmds.pointConstraint(controller, ikHandle, mo=True)
         cmds.orientConstraint(controller, joint, mo=True)
@@ -1156,16 +1351,13 @@ class FK:
         ''' 
         FK controller creation. 
         '''
-        controller = cmds.circle(n='ctrl_' + jName, nr=(1, 0, 0), c=(0, 0, 0), r=controllerRadius)[0]
+        controller = cmds.circle(n='ctrl_' + jName, nr=(1, 0, 0), c=(0, 0, 0), r=controllerRadius, ch=False)[0]
         
-        ctrlParent = cmds.group(em=True, n='ctrl_' + jName + '_parent')
+        ctrlParent = cmds.group(em=True, n=controller + '_parent') # reuse the name the circle actually got
         cmds.parent(controller, ctrlParent)
 
-        cmds.pointConstraint(jName, ctrlParent, mo=False)
-        cmds.orientConstraint(jName, ctrlParent, mo=False)
-
-        cmds.delete(ctrlParent, cn=True)
-        cmds.makeIdentity(controller, apply=True, r=True, s=True, t=True, n=False, pn=True)
+        cmds.matchTransform(ctrlParent, jName, pos=True, rot=True) # snap without creating and deleting two constraints, 
+                                                                  # the controller rides along at identity so there's nothing to freeze
 
         cmds.parentConstraint(controller, jName, mo=True)
 
@@ -1178,23 +1370,30 @@ class FK:
     @staticmethod
     def createFKCharacterControllers(rootJoint = None, parent = None, endJoint = None, controllerRadius = 20):
         '''
-        Recursevly traverse the character skeleton and creates a default controller at every joint.
-        '''  
-        controllers = []
-        controller = FK.createFKController(rootJoint, parent, controllerRadius)   
-        controllers.append(controller)
+        Traverses the character skeleton and creates a default controller at every joint.
+        The hierarchy is fetched with a single listRelatives call and walked with a stack instead of recursion.
+        '''
+        with Helpers.batchedMayaOp('createFKControllers'): # folds into the caller's block when there is one
+            descendants = cmds.listRelatives(rootJoint, ad=True, type='joint', fullPath=True) or []
 
-        if endJoint is not None:        
-            if rootJoint == endJoint:
-                return controllers
+            kids = {} # full path -> child full paths, rebuilt from the paths themselves so no more listRelatives calls per joint
+            for path in reversed(descendants): # -ad lists the deepest joints first, reversing keeps the siblings in hierarchy order
+                kids.setdefault(path.rsplit('|', 1)[0], []).append(path)
 
-        kids = cmds.listRelatives(rootJoint, c=True, type='joint')
+            controllers = []
+            stack = [(cmds.ls(rootJoint, long=True)[0], rootJoint, parent)]
 
-        if kids:
-            for kid in kids:
-               controllers.extend(FK.createFKCharacterControllers(kid, rootJoint, endJoint, controllerRadius))
+            while stack:
+                path, joint, jParent = stack.pop()
+                controllers.append(FK.createFKController(joint, jParent, controllerRadius))
 
-        return controllers
+                if endJoint is not None and joint == endJoint:
+                    continue
+
+                for kid in reversed(kids.get(path, [])): # reversed so they pop off the stack in order
+                    stack.append((kid, kid.rsplit('|', 1)[-1], joint))
+
+            return controllers
 
 class Skeleton:
     '''
@@ -1205,15 +1404,15 @@ class Skeleton:
         '''
         Creates a joint with the given name, parent, and position.
         '''
-        cmds.select(clear=True)
+        if jParent:
+            cmds.select(jParent, r=True) # the joint command parents the new joint under the selection, no separate parent call
+        else:
+            cmds.select(clear=True)
 
         j = cmds.joint(n=jName, p=jPos)
 
         if jParent:
-            cmds.parent(j, jParent)
             cmds.joint(jParent, e=True, zso=True, oj='xyz', sao='yup')
-
-        cmds.select(j, r=True)
             
         return j
     
@@ -1221,9 +1420,9 @@ class Skeleton:
     def createJointFromMarker(markerName, markerData, jParent=None):
         '''
         Creates a joint between specified marker.
+        The markers need to be deleted beforehand, the joints take over their names.
         '''
         pos = markerData[markerName]
-        cmds.delete(markerName)
         return Skeleton.createJoint(jName=markerName, jParent=jParent, jPos=pos)
     
     @staticmethod
@@ -1231,13 +1430,17 @@ class Skeleton:
         '''
         Creates a joint chain between the specified markers.
         '''
-        parent = jParent
-        chain = []
+        if jParent:
+            cmds.select(jParent, r=True)
+        else:
+            cmds.select(clear=True)
+
+        chain = [cmds.joint(n=markerName, p=markerData[markerName]) for markerName in markerNames] # each new joint stays selected, so the next one gets created under it
 
-        for markerName in markerNames:
-            newJoint = Skeleton.createJointFromMarker(markerName, markerData, jParent=parent)
-            parent = newJoint
-            chain.append(newJoint)
+        for joint in ([jParent] if jParent else []) + chain[:-1]: # orient once the whole chain exists, each joint aims at the child under it so every child has to be there first
+            cmds.joint(joint, e=True, zso=True, oj='xyz', sao='yup')
+
+        cmds.joint(chain[-1], e=True, zso=True, oj='none') # the last joint was created in its parent's frame, put it back on the world axes like a joint parented from world space
 
         return chain
     
@@ -1246,111 +1449,169 @@ class Skeleton:
         '''
         Creates the skeleton from the given markers.
         '''
-        if splineSpine:
-            baseMarkers = [marker[0] for marker in Markers.defaultSplineBaseMarkers()]
-        else:
-            baseMarkers = [marker[0] for marker in Markers.defaultBaseMarkers()]
+        with Helpers.batchedMayaOp('createSkeleton'): # one undo step and no redraws for the whole skeleton
+            if splineSpine:
+                baseMarkers = Markers.splineBaseMarkerNames
+            else:
+                baseMarkers = Markers.baseMarkerNames
 
-        leftSideMarkers = [marker[0] for marker in Markers.defaultLeftMarkers()]
-        rightSideMarkers = [marker[0] for marker in Markers.defaultRightMarkers()]
+            leftSideMarkers = Markers.leftMarkerNames
+            rightSideMarkers = Markers.rightMarkerNames
 
-        rootJ = Skeleton.createJointFromMarker('root', markerData) # base joints
-        pelvisJ = Skeleton.createJointFromMarker('pelvis', markerData, jParent=rootJ)
-        spineJs = Skeleton.createJointChainFromMarkers(baseMarkers[2:], markerData, jParent=pelvisJ)
+            rootJ = Skeleton.createJointFromMarker('root', markerData) # base joints
+            pelvisJ = Skeleton.createJointFromMarker('pelvis', markerData, jParent=rootJ)
+            spineJs = Skeleton.createJointChainFromMarkers(baseMarkers[2:], markerData, jParent=pelvisJ)
 
-        leftArmJs = Skeleton.createJointChainFromMarkers(leftSideMarkers[:4], markerData, jParent=spineJs[-3]) # left joints
-        leftThumbJs = Skeleton.createJointChainFromMarkers(leftSideMarkers[4:7], markerData, jParent=leftArmJs[-1])
-        leftIndexJs = Skeleton.createJointChainFromMarkers(leftSideMarkers[7:10], markerData, jParent=leftArmJs[-1])
-        leftMiddleJs = Skeleton.createJointChainFromMarkers(leftSideMarkers[10:13], markerData, jParent=leftArmJs[-1])
-        leftLegJs = Skeleton.createJointChainFromMarkers(leftSideMarkers[13:], markerData, jParent=pelvisJ)
+            leftArmJs = Skeleton.createJointChainFromMarkers(leftSideMarkers[:4], markerData, jParent=spineJs[-3]) # left joints
+            leftThumbJs = Skeleton.createJointChainFromMarkers(leftSideMarkers[4:7], markerData, jParent=leftArmJs[-1])
+            leftIndexJs = Skeleton.createJointChainFromMarkers(leftSideMarkers[7:10], markerData, jParent=leftArmJs[-1])
+            leftMiddleJs = Skeleton.createJointChainFromMarkers(leftSideMarkers[10:13], markerData, jParent=leftArmJs[-1])
+            leftLegJs = Skeleton.createJointChainFromMarkers(leftSideMarkers[13:], markerData, jParent=pelvisJ)
 
-        rightArmJs = Skeleton.createJointChainFromMarkers(rightSideMarkers[:4], markerData, jParent=spineJs[-3]) # right joints
-        rightThumbJs = Skeleton.createJointChainFromMarkers(rightSideMarkers[4:7], markerData, jParent=rightArmJs[-1])
-        rightIndexJs = Skeleton.createJointChainFromMarkers(rightSideMarkers[7:10], markerData, jParent=rightArmJs[-1])
-        rightMiddleJs = Skeleton.createJointChainFromMarkers(rightSideMarkers[10:13], markerData, jParent=rightArmJs[-1])
-        rightLegJs = Skeleton.createJointChainFromMarkers(rightSideMarkers[13:], markerData, jParent=pelvisJ)
+            rightArmJs = Skeleton.createJointChainFromMarkers(rightSideMarkers[:4], markerData, jParent=spineJs[-3]) # right joints
+            rightThumbJs = Skeleton.createJointChainFromMarkers(rightSideMarkers[4:7], markerData, jParent=rightArmJs[-1])
+            rightIndexJs = Skeleton.createJointChainFromMarkers(rightSideMarkers[7:10], markerData, jParent=rightArmJs[-1])
+            rightMiddleJs = Skeleton.createJointChainFromMarkers(rightSideMarkers[10:13], markerData, jParent=rightArmJs[-1])
+            rightLegJs = Skeleton.createJointChainFromMarkers(rightSideMarkers[13:], markerData, jParent=pelvisJ)
 
-        return rootJ, pelvisJ, spineJs, leftArmJs, leftThumbJs, leftIndexJs, leftMiddleJs, leftLegJs, rightArmJs, rightThumbJs, rightIndexJs, rightMiddleJs, rightLegJs
+            return rootJ, pelvisJ, spineJs, leftArmJs, leftThumbJs, leftIndexJs, leftMiddleJs, leftLegJs, rightArmJs, rightThumbJs, rightIndexJs, rightMiddleJs, rightLegJs
 
 class Markers:
     '''
     Static class that contains helper methods that are used in the auto rigging process.
     '''
+    baseMarkers = ( # the default marker layouts never change, so they're built once when the module loads
+        ('root', (0, 0, 0)), ('pelvis', (0, 105, 0)), 
+        ('spine1', (0, 125, 5)), ('spine2', (0, 138, 2.5)), ('spine3', (0, 150, -4.5)), 
+        ('neck', (0, 158.5, -3)), ('head', (0, 181.5, 1))
+    )
+
+    splineBaseMarkers = (
+        ('root', (0, 0, 0)), ('pelvis', (0, 105, 0)), 
+        ('spine1',(0, 111, 1.5)), ('spine2',(0, 117, 3)), ('spine3',(0, 125,5)),
+        ('spine4',(0, 129, 4)), ('spine5',(0, 133,3)), ('spine6', (0, 138, 2.5)), 
+        ('spine7',(0, 142, 0.5)),('spine8',(0, 146, -2)),('spine9', (0.0, 150, -4.5)),
+        ('neck', (0, 158.5, -3)), ('head', (0, 181.5, 1))
+    )
+
+    leftMarkers = (
+        ('clavicle_l', (14, 149.5, -4.5)), ('upperArm_l', (23.5, 145.5, -4.5)),
+        ('lowerArm_l', (36, 129, -5.5)), ('hand_l', (58.5, 110, 5)),
+        ('thumb1_l', (57, 106, 11.5)), ('thumb2_l', (57, 104.5, 15)), ('thumb3_l', (57.5, 102, 19)),
+        ('index1_l', (64, 103, 12.5)), ('index2_l', (65, 98, 15)), ('index3_l', (64.5, 94.5, 17)),
+        ('middle1_l', (65, 102, 9)), ('middle2_l', (66, 96.5, 11)), ('middle3_l', (62, 92, 12.5)),
+        ('thigh_l', (9, 95, 1)), ('knee_l', (14, 55, 0)), ('foot_l', (15.5, 15.5, -6)),
+        ('ball_l', (17, 3.5, 5)), ('toe_l', (17, 3.5, 15.5))
+    )
+
+    rightMarkers = tuple((name[:-2] + '_r', (-x, y, z)) for name, (x, y, z) in leftMarkers) # swap the _l suffix, same as the mirror button does
+
+    baseMarkerNames = tuple(name for name, pos in baseMarkers) # name only versions for building the skeleton
+    splineBaseMarkerNames = tuple(name for name, pos in splineBaseMarkers)
+    leftMarkerNames = tuple(name for name, pos in leftMarkers)
+    rightMarkerNames = tuple(name for name, pos in rightMarkers)
+
     @staticmethod
     def defaultBaseMarkers():
         '''
         Returns the base markers for the skeleton guides.
         '''
-        return [
-            ('root', (0, 0, 0)), ('pelvis', (0, 105, 0)), 
-            ('spine1', (0, 125, 5)), ('spine2', (0, 138, 2.5)), ('spine3', (0, 150, -4.5)), 
-            ('neck', (0, 158.5, -3)), ('head', (0, 181.5, 1))
-        ]
+        return Markers.baseMarkers # the shared tuple, += on it builds a new one so it can't be changed by callers
     
     @staticmethod
     def defaultLeftMarkers():
         '''
         Returns the left markers for the skeleton guides.        
         '''
-        return [
-            ('clavicle_l', (14, 149.5, -4.5)), ('upperArm_l', (23.5, 145.5, -4.5)),
-            ('lowerArm_l', (36, 129, -5.5)), ('hand_l', (58.5, 110, 5)),
-            ('thumb1_l', (57, 106, 11.5)), ('thumb2_l', (57, 104.5, 15)), ('thumb3_l', (57.5, 102, 19)),
-            ('index1_l', (64, 103, 12.5)), ('index2_l', (65, 98, 15)), ('index3_l', (64.5, 94.5, 17)),
-            ('middle1_l', (65, 102, 9)), ('middle2_l', (66, 96.5, 11)), ('middle3_l', (62, 92, 12.5)),
-            ('thigh_l', (9, 95, 1)), ('knee_l', (14, 55, 0)), ('foot_l', (15.5, 15.5, -6)),
-            ('ball_l', (17, 3.5, 5)), ('toe_l', (17, 3.5, 15.5))
-        ]
+        return Markers.leftMarkers
     
     @staticmethod
     def defaultRightMarkers():
         '''
         Returns the right markers for the skeleton guides.
         '''
-        rightMarkers = []
-
-        for name, (x, y, z) in Markers.defaultLeftMarkers():
-            rightMarkers.append((name.replace('_l', '_r'), (-x, y, z)))
-
-        return rightMarkers
+        return Markers.rightMarkers
     
     @staticmethod
     def defaultSplineBaseMarkers():
         '''
         Returns the base markers for the spline spine.
         '''
-        return [
-            ('root', (0, 0, 0)), ('pelvis', (0, 105, 0)), 
-            ('spine1',(0, 111, 1.5)), ('spine2',(0, 117, 3)), ('spine3',(0, 125,5)),
-            ('spine4',(0, 129, 4)), ('spine5',(0, 133,3)), ('spine6', (0, 138, 2.5)), 
-            ('spine7',(0, 142, 0.5)),('spine8',(0, 146, -2)),('spine9', (0.0, 150, -4.5)),
-            ('neck', (0, 158.5, -3)), ('head', (0, 181.5, 1))
-        ]
+        return Markers.splineBaseMarkers
     
     @staticmethod
     def createMarkers(markers):
         '''
         Creates the markers for the skeleton guides.
         '''
-        locators = []
+        with Helpers.batchedMayaOp('createMarkers'): # one undo step and no redraws for the whole set of locators
+            locators = []
 
-        for marker in markers:
-            loc = cmds.spaceLocator(n=marker[0])[0]  # cmds.spaceLocator returns a list, take the first item
-            cmds.move(marker[1][0], marker[1][1], marker[1][2], loc)  # Position the locator
+            for marker in markers:
+                loc = cmds.spaceLocator(n=marker[0])[0]  # cmds.spaceLocator returns a list, take the first item
+                cmds.move(marker[1][0], marker[1][1], marker[1][2], loc)  # Position the locator
 
-            cmds.setAttr(loc + '.localScale', 5, 5, 5, type='double3')    
+                cmds.setAttr(loc + '.localScale', 5, 5, 5, type='double3')    
 
-            locators.append(loc)        
+                locators.append(loc)        
 
-        group = cmds.group(locators, name='MarkersGrp')
-        cmds.xform(group, pivots=(0, 0, 0), worldSpace=True)
+            group = cmds.group(locators, name='MarkersGrp')
+            cmds.xform(group, pivots=(0, 0, 0), worldSpace=True)
         
-        return group
+            return group
     
 class Helpers:
     '''
     Static class that contains helper methods that are used in the auto rigging process.
     '''
+    batchDepth = 0 # how many batchedMayaOp blocks are currently open
+    screenSizeCache = None # filled the first time the screen size is asked for
+
+    @staticmethod
+    def screenSize():
+        '''
+        Returns the size of the primary screen, it's only queried once and shared by all the widgets.
+        '''
+        if Helpers.screenSizeCache is None:
+            Helpers.screenSizeCache = QGuiApplication.primaryScreen().size()
+
+        return Helpers.screenSizeCache
+
+    @staticmethod
+    @contextmanager
+    def batchedMayaOp(chunkName = 'autoRigger'):
+        '''
+        Groups every maya command issued inside the block into a single undo chunk and suspends the viewport refresh until the block ends.
+        Auto key and the evaluation manager are switched off for the duration so intermediate commands don't revalidate the graph.
+        Nested blocks are folded into the outermost one.
+        '''
+        Helpers.batchDepth += 1
+        restoreSteps = [] # one entry per setup step that went through, so a failed setup only undoes what it actually changed
+
+        try:
+            if Helpers.batchDepth == 1:
+                cmds.undoInfo(openChunk=True, chunkName=chunkName)
+                restoreSteps.append(partial(cmds.undoInfo, closeChunk=True))
+
+                cmds.refresh(suspend=True)
+                restoreSteps.append(partial(cmds.refresh, force=True)) # a single redraw for everything the block did
+                restoreSteps.append(partial(cmds.refresh, suspend=False))
+
+                autoKey = cmds.autoKeyframe(q=True, state=True)
+                cmds.autoKeyframe(state=False)
+                restoreSteps.append(partial(cmds.autoKeyframe, state=autoKey))
+
+                evaluationMode = cmds.evaluationManager(q=True, mode=True)[0]
+                cmds.evaluationManager(mode='off')
+                restoreSteps.append(partial(cmds.evaluationManager, mode=evaluationMode)) # restore whatever the user had before
+
+            yield
+        finally:
+            Helpers.batchDepth -= 1
+
+            for restoreStep in reversed(restoreSteps):
+                restoreStep()
+
     @staticmethod
     def lockAndHide(node, attributes):
         '''
@@ -1367,6 +1628,40 @@ class Helpers:
         for attr in attributes:
             cmds.setAttr(node + '.' + attr, l = False, k = True, cb = True)
 
+    @staticmethod
+    def getDependNode(node):
+        '''
+        Returns the MObject of the given node name.
+        '''
+        selectionList = om2.MSelectionList()
+        selectionList.add(node)
+
+        return selectionList.getDependNode(0)
+
+    @staticmethod
+    def getWorldTranslation(node):
+        '''
+        Returns the world space translation of the given transform as an MVector, without going through cmds.xform.
+        '''
+        selectionList = om2.MSelectionList()
+        selectionList.add(node)
+
+        return om2.MFnTransform(selectionList.getDagPath(0)).translation(om2.MSpace.kWorld)
+
+    @staticmethod
+    def getObjectHandle(node):
+        '''
+        Returns an MObjectHandle to the given node, it stays valid if the node gets renamed or reparented.
+        '''
+        return om2.MObjectHandle(Helpers.getDependNode(node))
+
+    @staticmethod
+    def getNodeName(handle):
+        '''
+        Returns the current full path of the dag node the given handle points to.
+        '''
+        return om2.MFnDagNode(handle.object()).fullPathName()
+
     @staticmethod
     def changeControllerProperites(controller, color = None, width = None):
         '''
@@ -1385,18 +1680,32 @@ class Helpers:
         '''
         Creates a circle control for the given joint.
         '''
-        cntrl = cmds.circle(n=ctrlName, nr=(0, 0, 1), c=(0, 0, 0), r=radius)[0]
+        cntrl = cmds.circle(n=ctrlName, nr=(0, 0, 1), c=(0, 0, 0), r=radius, ch=False)[0]
         Helpers.changeControllerProperites(cntrl, color=13)
 
-        cmds.pointConstraint(joint, cntrl)
-        cmds.delete(cntrl, cn=True)
+        cmds.matchTransform(cntrl, joint, pos=True)
 
         cmds.rotate(90, 0, 0, cntrl)
 
         cmds.makeIdentity(cntrl, apply=True, r=True, s=True, t=True, n=False, pn=True)
-        cmds.delete(cntrl, ch=True)
 
         return cntrl
 
-arGUI = AutoRiggerGUI() # Create an instance of the AutoRiggerGUI class and show it
-arGUI.show()
\ No newline at end of file
+arGUI = globals().get('arGUI') # the open window, kept when the module is reloaded or the script is run again, importing doesn't build any GUI
+
+def launch():
+    '''
+    Shows the auto rigger, a window that's already open gets brought to the front instead of stacking a second one.
+    '''
+    global arGUI
+
+    if arGUI is None or not arGUI.isVisible(): # a closed window starts over with a fresh rig
+        arGUI = AutoRiggerGUI()
+
+    arGUI.show()
+    arGUI.raise_()
+    arGUI.activateWindow() # raise_ only restacks it, this gives it the keyboard focus too
+    return arGUI
+
+if __name__ == '__main__': # running the file from the script editor still opens the window
+    launch()
\ No newline at end of file